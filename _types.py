@@ -2,11 +2,18 @@
 Type definitions for the Japanese tokenizer.
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Optional, List, Tuple
 from enum import IntEnum
 
 
+# Dictionary data is built from many small instances, which are smaller and faster
+# to create with __slots__. dataclass only supports generating them from Python 3.10
+# (adding __slots__ by hand conflicts with the field defaults).
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 class WordType(IntEnum):
     """Word type flags for deinflection matching."""
     # Final word types
@@ -79,7 +86,7 @@ class CandidateWord:
     reason_chains: List[List[Reason]]  # How this word was derived
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class KanjiReading:
     """Kanji reading (written form)."""
     text: str
@@ -94,7 +101,7 @@ class KanjiReading:
             self.match_range = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class KanaReading:
     """Kana reading (pronunciation)."""
     text: str
@@ -110,7 +117,7 @@ class KanaReading:
             self.match_range = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Gloss:
     """Definition/gloss for a sense."""
     text: str
@@ -118,7 +125,7 @@ class Gloss:
     g_type: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Sense:
     """A sense (meaning) of a dictionary entry."""
     index: int
@@ -130,7 +137,7 @@ class Sense:
     dial: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WordEntry:
     """A dictionary word entry."""
     entry_id: int
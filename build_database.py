@@ -6,6 +6,7 @@ from the XML source file, including automatic downloading if needed.
 """
 
 import sys
+import json
 import sqlite3
 import gzip
 import shutil
@@ -190,12 +191,30 @@ class JMDictConverter:
             )
         """)
         
+        # Each entry's readings and senses as one JSON document (see write_entry_payloads)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS entries_denorm (
+                entry_id INTEGER PRIMARY KEY,
+                payload BLOB NOT NULL,
+                FOREIGN KEY (entry_id) REFERENCES entries(entry_id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Build metadata (key/value pairs computed once from the data)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        
         # Create indexes for fast lookups
         if self.show_progress:
             print("Creating indexes...")
-        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanji_text ON kanji(kanji_text)")
+        # Text lookups only need the entry_id, so these indexes cover them
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanji_text_entry ON kanji(kanji_text, entry_id)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_kanji_entry ON kanji(entry_id)")
-        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_reading_text ON readings(reading_text)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_reading_text_entry ON readings(reading_text, entry_id)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_reading_entry ON readings(entry_id)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_gloss_text ON glosses(gloss_text)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_gloss_sense ON glosses(sense_id)")
@@ -551,6 +570,110 @@ class JMDictConverter:
         if self.show_progress:
             print(f"\nCompleted: {self.entry_count:,} entries processed")
         
+    def write_metadata(self):
+        """Store values derived from the data that are expensive to compute at runtime."""
+        # Length of the longest kanji/reading text: no longer lookup can match
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO metadata (key, value)
+            SELECT 'max_lookup_length', COALESCE(MAX(
+                (SELECT MAX(LENGTH(reading_text)) FROM readings),
+                (SELECT MAX(LENGTH(kanji_text)) FROM kanji)
+            ), 0)
+        """)
+        self.conn.commit()
+    
+    def write_entry_payloads(self, batch_size: int = 5000):
+        """
+        Store each entry's readings and senses as one JSON document in entries_denorm.
+        
+        The dictionary reads these when fetching entries instead of querying each
+        table. Arrays are used to keep the documents compact:
+        
+            {"k": [[kanji_text, priority, info], ...],
+             "r": [[reading_text, no_kanji, priority, info], ...],
+             "s": [[sense_index, info, pos, glosses, field, misc, dial], ...]}
+        
+        where glosses is [[gloss_text, lang, g_type], ...] and pos, field, misc and
+        dial are lists of strings.
+        """
+        if self.show_progress:
+            print("Writing entry payloads...")
+        
+        first_id, last_id = self.cursor.execute(
+            "SELECT MIN(entry_id), MAX(entry_id) FROM entries"
+        ).fetchone()
+        if first_id is None:
+            return
+        
+        for start in range(first_id, last_id + 1, batch_size):
+            params = (start, start + batch_size - 1)
+            
+            kanji = {}
+            for entry_id, *row in self.cursor.execute("""
+                SELECT entry_id, kanji_text, priority, info
+                FROM kanji
+                WHERE entry_id BETWEEN ? AND ?
+                ORDER BY entry_id, kanji_id
+            """, params).fetchall():
+                kanji.setdefault(entry_id, []).append(row)
+            
+            readings = {}
+            for entry_id, *row in self.cursor.execute("""
+                SELECT entry_id, reading_text, no_kanji, priority, info
+                FROM readings
+                WHERE entry_id BETWEEN ? AND ?
+                ORDER BY entry_id, reading_id
+            """, params).fetchall():
+                readings.setdefault(entry_id, []).append(row)
+            
+            # Lists of the sense child tables, by sense_id
+            children = {}
+            for index, (table, columns, order) in enumerate([
+                ('sense_pos', 'pos', 'sense_pos_id'),
+                ('glosses', 'gloss_text, lang, g_type', 'gloss_id'),
+                ('sense_field', 'field', 'sense_field_id'),
+                ('sense_misc', 'misc', 'sense_misc_id'),
+                ('sense_dial', 'dial', 'sense_dial_id'),
+            ]):
+                for sense_id, *values in self.cursor.execute(f"""
+                    SELECT c.sense_id, {columns}
+                    FROM {table} c
+                    JOIN senses s ON s.sense_id = c.sense_id
+                    WHERE s.entry_id BETWEEN ? AND ?
+                    ORDER BY c.{order}
+                """, params).fetchall():
+                    # Glosses are [gloss_text, lang, g_type]; the other tables are single strings
+                    value = values if len(values) > 1 else values[0]
+                    children.setdefault(sense_id, ([], [], [], [], []))[index].append(value)
+            
+            senses = {}
+            for entry_id, sense_id, sense_index, info in self.cursor.execute("""
+                SELECT entry_id, sense_id, sense_index, info
+                FROM senses
+                WHERE entry_id BETWEEN ? AND ?
+                ORDER BY entry_id, sense_index
+            """, params).fetchall():
+                senses.setdefault(entry_id, []).append(
+                    [sense_index, info, *children.get(sense_id, ([], [], [], [], []))]
+                )
+            
+            entry_ids = [row[0] for row in self.cursor.execute(
+                "SELECT entry_id FROM entries WHERE entry_id BETWEEN ? AND ?", params
+            ).fetchall()]
+            self.cursor.executemany(
+                "INSERT OR REPLACE INTO entries_denorm (entry_id, payload) VALUES (?, ?)",
+                (
+                    (entry_id, json.dumps({
+                        'k': kanji.get(entry_id, []),
+                        'r': readings.get(entry_id, []),
+                        's': senses.get(entry_id, []),
+                    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+                    for entry_id in entry_ids
+                )
+            )
+        
+        self.conn.commit()
+    
     def optimize(self, vita_mode: bool = False):
         """Optimize database after conversion."""
         if self.show_progress:
@@ -754,6 +877,8 @@ def build_database(
         converter.connect()
         converter.create_schema()
         converter.convert(str(xml_path), batch_size=1000)
+        converter.write_metadata()
+        converter.write_entry_payloads()
         converter.optimize(vita_mode=False)
         converter.get_stats()
         
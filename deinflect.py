@@ -10,6 +10,32 @@ from ._types import CandidateWord, WordType, Reason
 from .deinflect_rules import get_deinflect_rule_groups
 from .normalize import kana_to_hiragana
 
+# The rule groups are read-only, so build them once and share them across
+# calls rather than rebuilding every rule dict per word.
+_RULE_GROUPS = get_deinflect_rule_groups()
+
+
+def _index_rules_by_ending(rule_groups: List[dict]) -> List[Dict[str, List[dict]]]:
+    """
+    Index the rules of each group by the ending they apply to.
+    
+    Args:
+        rule_groups: Rule groups from get_deinflect_rule_groups
+        
+    Returns:
+        For each rule group, a dictionary of its rules (in rule order) by 'from'
+    """
+    indexes = []
+    for rule_group in rule_groups:
+        rules_by_ending: Dict[str, List[dict]] = {}
+        for rule in rule_group['rules']:
+            rules_by_ending.setdefault(rule['from'], []).append(rule)
+        indexes.append(rules_by_ending)
+    return indexes
+
+
+_RULES_BY_ENDING = _index_rules_by_ending(_RULE_GROUPS)
+
 
 def deinflect(word: str) -> List[CandidateWord]:
     """
@@ -27,7 +53,7 @@ def deinflect(word: str) -> List[CandidateWord]:
     """
     result: List[CandidateWord] = []
     result_index: Dict[str, int] = {}
-    rule_groups = get_deinflect_rule_groups()
+    rule_groups = _RULE_GROUPS
     
     # Start with the original word
     original = CandidateWord(
@@ -100,30 +126,43 @@ def deinflect(word: str) -> List[CandidateWord]:
                 if new_word not in result_index:
                     result_index[new_word] = len(result) - 1
         
+        # Reasons already applied to this candidate; collected once rather than
+        # per matching rule.
+        seen_reasons = {r for chain in this_candidate.reason_chains for r in chain}
+        
         # Try to apply deinflection rules
-        for rule_group in rule_groups:
-            if rule_group['fromLen'] > len(word_text):
+        word_len = len(word_text)
+        for rule_group, rules_by_ending in zip(rule_groups, _RULES_BY_ENDING):
+            if rule_group['fromLen'] > word_len:
                 continue
             
             ending = word_text[-rule_group['fromLen']:]
             hiragana_ending = kana_to_hiragana(ending)
             
-            for rule in rule_group['rules']:
+            # Only visit the rules for this ending, rather than comparing every
+            # rule's ending
+            if ending == hiragana_ending:
+                rules = rules_by_ending.get(ending, ())
+            elif ending in rules_by_ending and hiragana_ending in rules_by_ending:
+                # (Both forms have rules: keep them in rule order)
+                rules = [
+                    rule for rule in rule_group['rules']
+                    if rule['from'] == ending or rule['from'] == hiragana_ending
+                ]
+            else:
+                rules = rules_by_ending.get(ending) or rules_by_ending.get(hiragana_ending, ())
+            
+            for rule in rules:
                 if not (word_type & rule['fromType']):
                     continue
                 
-                if ending != rule['from'] and hiragana_ending != rule['from']:
-                    continue
-                
                 new_word = word_text[:-len(rule['from'])] + rule['to']
                 if not new_word:
                     continue
                 
                 # Continue if the rule introduces a duplicate in the reason chain,
                 # as it wouldn't make sense grammatically.
-                rule_reasons_set = set(rule['reasons'])
-                flat_reasons = [r for chain in this_candidate.reason_chains for r in chain]
-                if any(r in rule_reasons_set for r in flat_reasons):
+                if not seen_reasons.isdisjoint(rule['reasons']):
                     continue
                 
                 # If we already have a candidate for this word with the same
@@ -5,7 +5,7 @@ This module defines the abstract base class for dictionary implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List, Optional
 from ._types import WordEntry
 
 
@@ -25,4 +25,41 @@ class Dictionary(ABC):
             List of WordEntry objects matching the input
         """
         pass
-
+    
+    def get_words_many(
+        self,
+        inputs: List[str],
+        max_results: int,
+        matching_text: Optional[str] = None
+    ) -> List[List[WordEntry]]:
+        """
+        Look up several words in the dictionary.
+        
+        Implementations can override this to look up the inputs together; by
+        default, get_words is called for each input.
+        
+        Args:
+            inputs: The texts to look up
+            max_results: Maximum number of results to return per input
+            matching_text: Optional text that was actually matched (for setting matchRange)
+            
+        Returns:
+            List of results, one list of WordEntry objects per input (in input order)
+        """
+        return [
+            self.get_words(input_text, max_results, matching_text=matching_text)
+            for input_text in inputs
+        ]
+    
+    def prefetch_words(self, inputs: Iterable[str], max_results: int):
+        """
+        Prepare for looking up several words.
+        
+        Implementations can override this to look up the inputs ahead of time
+        (e.g. together); by default, nothing is done.
+        
+        Args:
+            inputs: The texts that will be looked up
+            max_results: Maximum number of results they will be looked up with
+        """
+        pass
@@ -4,12 +4,32 @@ Text normalization utilities.
 Handles Unicode normalization, full-width number conversion, and ZWNJ stripping.
 """
 
+import re
 import unicodedata
+from functools import lru_cache
 from typing import Tuple, List
 
 
 ZWNJ = 0x200C  # Zero-width non-joiner
 
+# Katakana characters converted by kana_to_hiragana (ァ-ヺ)
+_KATAKANA_RE = re.compile('[\u30A1-\u30FA]')
+
+# Translation table for half_to_full_width_num: 0-9 (0x0030-0x0039) to ０-９
+# (0xFF10-0xFF19)
+_FULL_WIDTH_DIGITS = str.maketrans({code: code - 0x0030 + 0xFF10 for code in range(0x0030, 0x003A)})
+
+# Translation table for kana_to_hiragana. Katakana ァ-ヶ (0x30A1-0x30F6) map to
+# hiragana 0x60 code points below; ヷ-ヺ have no hiragana with dakuten, so they
+# map to the plain kana.
+_KATAKANA_TO_HIRAGANA = str.maketrans({
+    **{code: code - 0x60 for code in range(0x30A1, 0x30F7)},
+    0x30F7: 'わ',  # ヷ
+    0x30F8: 'ゐ',  # ヸ
+    0x30F9: 'ゑ',  # ヹ
+    0x30FA: 'を',  # ヺ
+})
+
 
 def half_to_full_width_num(text: str) -> str:
     """
@@ -21,16 +41,7 @@ def half_to_full_width_num(text: str) -> str:
     Returns:
         Text with half-width numbers converted to full-width
     """
-    result = []
-    for char in text:
-        code = ord(char)
-        # Half-width digits: 0-9 (0x0030-0x0039)
-        if 0x0030 <= code <= 0x0039:
-            # Convert to full-width: ０-９ (0xFF10-0xFF19)
-            result.append(chr(code - 0x0030 + 0xFF10))
-        else:
-            result.append(char)
-    return ''.join(result)
+    return text.translate(_FULL_WIDTH_DIGITS)
 
 
 def to_normalized(text: str) -> Tuple[str, List[int]]:
@@ -55,6 +66,11 @@ def to_normalized(text: str) -> Tuple[str, List[int]]:
     if not normalized:
         return normalized, [0]
     
+    # Without characters outside the BMP (surrogate pairs in UTF-16), every
+    # character is one code unit, so the mapping is simply 0..len
+    if max(normalized) <= '\uffff':
+        return normalized, list(range(len(normalized) + 1))
+    
     # Build input lengths array
     # This maps each position in the normalized string to the original input length
     input_lengths = []
@@ -98,6 +114,14 @@ def do_strip_zwnj(normalized: str, input_lengths: List[int]) -> Tuple[str, List[
     Returns:
         Tuple of (text_without_zwnj, adjusted_input_lengths)
     """
+    # Nothing to strip (the usual case): keep one length per character, plus the
+    # final one, like the loop below
+    if chr(ZWNJ) not in normalized:
+        new_lengths = input_lengths[:len(normalized)]
+        if normalized and input_lengths[len(normalized)]:
+            new_lengths.append(input_lengths[len(normalized)])
+        return normalized, new_lengths
+    
     result = []
     new_lengths = []
     last = 0
@@ -161,33 +185,37 @@ def normalize_input(
     return normalized, input_lengths
 
 
+def has_katakana(text: str) -> bool:
+    """
+    Check if text contains katakana that kana_to_hiragana would convert.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        True if the text contains at least one convertible katakana character
+    """
+    return _KATAKANA_RE.search(text) is not None
+
+
+@lru_cache(maxsize=16384)
 def kana_to_hiragana(text: str) -> str:
     """
     Convert katakana to hiragana.
     
+    Results are memoized, since deinflection converts the same short word
+    endings over and over; the function must stay pure.
+    
     Args:
         text: Input text (may contain katakana)
         
     Returns:
-        Text with katakana converted to hiragana
+        Text with katakana converted to hiragana. If there is nothing to convert,
+        the input string itself is returned.
     """
-    result = []
-    for char in text:
-        code = ord(char)
-        # Katakana range: 0x30A0-0x30FF
-        # Hiragana range: 0x3040-0x309F
-        if 0x30A1 <= code <= 0x30F6:
-            # Convert katakana to hiragana
-            result.append(chr(code - 0x30A0 + 0x3040))
-        elif code == 0x30F7:  # ヷ
-            result.append('わ')
-        elif code == 0x30F8:  # ヸ
-            result.append('ゐ')
-        elif code == 0x30F9:  # ヹ
-            result.append('ゑ')
-        elif code == 0x30FA:  # ヺ
-            result.append('を')
-        else:
-            result.append(char)
-    return ''.join(result)
+    # Most text passed in (hiragana, kanji) has no katakana: skip building a new string
+    if not has_katakana(text):
+        return text
+    
+    return text.translate(_KATAKANA_TO_HIRAGANA)
 
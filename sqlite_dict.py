@@ -5,8 +5,18 @@ This module provides a SQLite-based dictionary implementation using the
 JMDict SQLite database.
 """
 
+import functools
+import json
+import os
 import sqlite3
-from typing import List, Optional
+import sys
+import threading
+import weakref
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from pathlib import Path
 
 from .dictionary import Dictionary
@@ -17,18 +27,336 @@ from .normalize import kana_to_hiragana
 from .database_path import find_database_path, get_default_database_path
 from .build_database import build_database
 
+# Try to use the C implementation of an LRU dict, fall back to OrderedDict
+try:
+    from lru import LRU
+    HAS_LRU_DICT = True
+except ImportError:
+    HAS_LRU_DICT = False
+
+# Try to use orjson for decoding entry payloads, fall back to json
+try:
+    import orjson
+    _json_loads = orjson.loads
+    HAS_ORJSON = True
+except ImportError:
+    _json_loads = json.loads
+    HAS_ORJSON = False
+
+
+class _LRUCache(OrderedDict):
+    """
+    Pure-Python fallback for lru.LRU: a dict that evicts the least recently used key.
+    
+    The caches are shared between threads (see lookup_many_parallel). Updating the
+    order and evicting take several steps, so they are done under a lock.
+    """
+    
+    def __init__(self, size: int):
+        super().__init__()
+        self.size = size
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                self.move_to_end(key)
+            except KeyError:
+                return default
+            return super().__getitem__(key)
+    
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.size:
+                self.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            super().clear()
+
+
+# Entry IDs matching a lookup. Readings are searched first; kanji are only searched
+# if no reading matched (some kanji entries may be katakana, so both forms are tried).
+# Doing both in one statement saves a round trip when the lookup is on kanji.
+_ENTRY_IDS_SQL_TEMPLATE = """
+    WITH reading_matches AS (
+        {reading_matches}
+        LIMIT ?{limit}
+    )
+    SELECT entry_id, ent_seq FROM reading_matches
+    UNION ALL
+    SELECT * FROM (
+        {kanji_matches}
+            AND NOT EXISTS (SELECT 1 FROM reading_matches)
+        LIMIT ?{limit}
+    )
+"""
+
+# Parameters: ?1 = text, ?2 = limit
+# With a single form, entries are selected with IN subqueries rather than joins, so
+# they don't need a DISTINCT pass (a temporary B-tree). The results are the same,
+# since the text indexes list each text's rows in entry order.
+_ENTRY_IDS_SQL_ONE_FORM = _ENTRY_IDS_SQL_TEMPLATE.format(
+    reading_matches="""SELECT entry_id, ent_seq
+        FROM entries
+        WHERE entry_id IN (SELECT entry_id FROM readings WHERE reading_text = ?1)""",
+    kanji_matches="""SELECT entry_id, ent_seq
+        FROM entries
+        WHERE entry_id IN (SELECT entry_id FROM kanji WHERE kanji_text = ?1)""",
+    limit=2
+)
+
+# Parameters: ?1 = original text, ?2 = text normalized to hiragana, ?3 = limit
+# This is kept as a join: results are in index order of the two texts (which
+# affects which entries are within the limit), and IN subqueries would change it.
+_ENTRY_IDS_SQL_TWO_FORMS = _ENTRY_IDS_SQL_TEMPLATE.format(
+    reading_matches="""SELECT DISTINCT e.entry_id, e.ent_seq
+        FROM entries e
+        JOIN readings r ON e.entry_id = r.entry_id
+        WHERE r.reading_text = ?1 OR r.reading_text = ?2""",
+    kanji_matches="""SELECT DISTINCT e.entry_id, e.ent_seq
+        FROM entries e
+        JOIN kanji k ON e.entry_id = k.entry_id
+        WHERE (k.kanji_text = ?1 OR k.kanji_text = ?2)""",
+    limit=3
+)
+
+
+# All data of several entries in one statement, as a union of rows tagged with the
+# table they come from:
+#   k: entry_id, kanji_text, priority, info
+#   r: entry_id, reading_text, priority, info, no_kanji
+#   s: entry_id, sense_id, info, sense_index
+#   p/g/f/m/d: sense_id, then pos / gloss_text, lang, g_type / field / misc / dial
+# The last column orders the rows of each entry (or sense). The entry IDs are
+# joined as a VALUES table, which lets SQLite loop over them with index lookups on
+# each table. The number of IDs is rounded up to a power of two (see
+# _padded_chunks) so that only a handful of distinct statements are generated, and
+# sqlite3's statement cache can reuse them instead of parsing and planning the
+# query again.
+_ENTRY_DATA_SQL_TEMPLATE = """
+    WITH ids(entry_id) AS (VALUES {values}),
+    s AS (
+        SELECT entry_id, sense_id, sense_index, info
+        FROM ids JOIN senses USING (entry_id)
+    )
+    SELECT 'k', entry_id, kanji_text, priority, info, NULL, kanji_id
+    FROM ids JOIN kanji USING (entry_id)
+    UNION ALL
+    SELECT 'r', entry_id, reading_text, priority, info, no_kanji, reading_id
+    FROM ids JOIN readings USING (entry_id)
+    UNION ALL
+    SELECT 's', entry_id, sense_id, info, NULL, NULL, sense_index
+    FROM s
+    UNION ALL
+    SELECT 'p', sense_id, pos, NULL, NULL, NULL, sense_pos_id
+    FROM s JOIN sense_pos USING (sense_id)
+    UNION ALL
+    SELECT 'g', sense_id, gloss_text, lang, g_type, NULL, gloss_id
+    FROM s JOIN glosses USING (sense_id)
+    UNION ALL
+    SELECT 'f', sense_id, field, NULL, NULL, NULL, sense_field_id
+    FROM s JOIN sense_field USING (sense_id)
+    UNION ALL
+    SELECT 'm', sense_id, misc, NULL, NULL, NULL, sense_misc_id
+    FROM s JOIN sense_misc USING (sense_id)
+    UNION ALL
+    SELECT 'd', sense_id, dial, NULL, NULL, NULL, sense_dial_id
+    FROM s JOIN sense_dial USING (sense_id)
+    ORDER BY 1, 2, 7
+"""
+
+
+# Maximum number of entries per entry data query. A power of two, so it isn't padded
+# further, and well below SQLITE_MAX_VARIABLE_NUMBER (999 in older SQLite versions).
+_MAX_BATCH_SIZE = 512
+
+
+# Entries whose readings or kanji are any of several texts, for get_words_many.
+# Rows are (0 for readings or 1 for kanji, text, entry_id, ent_seq). The texts are
+# looked up in their index, so with the usual query plan each text's rows are
+# together and in entry order (like the single-form query above) without sorting.
+# There is no ORDER BY, which would sort all rows, so _lookup_many doesn't rely
+# on this.
+_TEXT_MATCHES_SQL_TEMPLATE = """
+    WITH texts(text) AS (VALUES {values})
+    SELECT 0, r.reading_text, e.entry_id, e.ent_seq
+    FROM texts
+    JOIN readings r ON r.reading_text = texts.text
+    JOIN entries e ON e.entry_id = r.entry_id
+    UNION ALL
+    SELECT 1, k.kanji_text, e.entry_id, e.ent_seq
+    FROM texts
+    JOIN kanji k ON k.kanji_text = texts.text
+    JOIN entries e ON e.entry_id = k.entry_id
+"""
+
+
+# Entry payloads: all data of each entry as one JSON document, written at build
+# time (see JMDictConverter.write_entry_payloads). Used instead of the query above
+# if the database has them.
+_ENTRY_PAYLOADS_SQL_TEMPLATE = """
+    WITH ids(entry_id) AS (VALUES {values})
+    SELECT entry_id, payload FROM ids JOIN entries_denorm USING (entry_id)
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _values_sql(template: str, count: int) -> str:
+    """Fill in a query template with a VALUES list of count parameters."""
+    return template.format(values=', '.join(['(?)'] * count))
+
+
+def _padded_chunks(values: List[Any]) -> Iterator[Tuple[List[Any], int]]:
+    """
+    Split entry IDs (or texts) into chunks for the batched queries.
+    
+    Chunks stay below SQLite's limit on the number of parameters, and are padded
+    with -1 (never an ID or text) so that batches of similar size share a statement.
+    
+    Yields:
+        Tuples of (padded chunk, chunk size)
+    """
+    for start in range(0, len(values), _MAX_BATCH_SIZE):
+        chunk = values[start:start + _MAX_BATCH_SIZE]
+        count = 1 << (len(chunk) - 1).bit_length()
+        chunk.extend([-1] * (count - len(chunk)))
+        yield chunk, count
+
+
+def _entry_from_payload(entry_id: int, ent_seq: str, payload: bytes) -> WordEntry:
+    """Build an entry without match information from its JSON payload."""
+    data = _json_loads(payload)
+    return WordEntry(
+        entry_id=entry_id,
+        ent_seq=ent_seq,
+        kanji_readings=[
+            KanjiReading(text=text, priority=priority, info=info)
+            for text, priority, info in data['k']
+        ],
+        kana_readings=[
+            KanaReading(text=text, no_kanji=bool(no_kanji), priority=priority, info=info)
+            for text, no_kanji, priority, info in data['r']
+        ],
+        senses=[
+            Sense(
+                index=index,
+                pos_tags=pos_tags,
+                glosses=[
+                    Gloss(text=text, lang=lang or 'eng', g_type=g_type)
+                    for text, lang, g_type in glosses
+                ],
+                info=info,
+                field=field or None,
+                misc=misc or None,
+                dial=dial or None
+            )
+            for index, info, pos_tags, glosses, field, misc, dial in data['s']
+        ]
+    )
+
+
+class _CachedEntry(NamedTuple):
+    """
+    An entry without match information, with its readings normalized to hiragana.
+    
+    The entry itself is never returned: lookups get copies with match information
+    (see _set_match_range), so that callers modifying their results don't modify
+    the cache.
+    """
+    entry: WordEntry
+    kanji_normalized: Tuple[str, ...]
+    kana_normalized: Tuple[str, ...]
+
+
+def _copy_sense(sense: Sense) -> Sense:
+    """Copy a sense, including its lists and glosses."""
+    return Sense(
+        index=sense.index,
+        pos_tags=list(sense.pos_tags),
+        glosses=[Gloss(text=gloss.text, lang=gloss.lang, g_type=gloss.g_type) for gloss in sense.glosses],
+        info=sense.info,
+        field=None if sense.field is None else list(sense.field),
+        misc=None if sense.misc is None else list(sense.misc),
+        dial=None if sense.dial is None else list(sense.dial)
+    )
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the get_words cache (like functools.lru_cache's cache_info())."""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _CachedLookup(NamedTuple):
+    """
+    The entries found by a lookup, without match information.
+    
+    Which entries are found doesn't depend on the matching text, so lookups of the
+    same input with different matching texts share this (see get_words). It is
+    never returned itself: get_words copies its entries (see _matched_entries).
+    """
+    normalized_input: str
+    entries: Tuple[_CachedEntry, ...]
+
+
+def _normalize_matching(normalized_input: str, matching_text: Optional[str]) -> str:
+    """
+    Get the matching text of a lookup (for setting matchRange), normalized to hiragana.
+    
+    matching_text is what we're matching against (usually the original input before
+    deinflection); if None, the input is used. This matches 10ten Reader's behavior,
+    where matchingText is the input to getWords and is compared after kanaToHiragana.
+    """
+    if matching_text is None:
+        normalized_matching = normalized_input
+    else:
+        normalized_matching = kana_to_hiragana(matching_text)
+    # Interned like the cached entries' normalized readings, so that comparisons
+    # with them (see _set_match_range) are usually identity checks
+    return sys.intern(normalized_matching)
+
+
+def _make_lru_cache(size: int):
+    """Create an LRU cache holding up to size items (at least one)."""
+    size = max(size, 1)
+    return LRU(size) if HAS_LRU_DICT else _LRUCache(size)
+
 
 class SQLiteDictionary(Dictionary):
     """SQLite-based dictionary implementation."""
     
-    def __init__(self, db_path: Optional[str] = None, auto_build: bool = True):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        auto_build: bool = True,
+        cache_size: int = 10000,
+        preload_keys: bool = False
+    ):
         """
         Initialize SQLite dictionary.
         
         Args:
             db_path: Path to the SQLite database file. If None, uses default location.
+                     The database is opened read-only and must not be modified while
+                     the dictionary is open.
             auto_build: If True, automatically builds the database if it doesn't exist.
                        This will download and process the JMdict XML file if needed.
+            cache_size: Maximum number of get_words results to keep in memory.
+                       Tokenization looks up the same substrings repeatedly, so
+                       results (including empty ones) are cached. 0 disables caching.
+                       Also bounds the number of cached entries shared between lookups.
+                       Cached results are copied on every call, so callers may
+                       modify the entries they get.
+            preload_keys: If True, loads all kanji and reading texts into memory when
+                         connecting (about 50MB, taking about a second), so that looking
+                         up text that isn't in the dictionary doesn't query the database.
+                         Tokenization looks up many such substrings, so this pays off
+                         when processing large amounts of text.
         """
         if db_path is None:
             db_path_obj = get_default_database_path()
@@ -70,15 +398,145 @@ class SQLiteDictionary(Dictionary):
             )
         
         self.conn: Optional[sqlite3.Connection] = None
+        # Length of the longest kanji or reading text (see _read_max_lookup_length)
+        self._max_lookup_length: Optional[int] = None
+        self._preload_keys = preload_keys
+        # Every kanji and reading text, if preload_keys is set
+        self._known_keys: Optional[FrozenSet[str]] = None
+        # Connection of each thread (see _get_conn)
+        self._local = threading.local()
+        # Finalizers closing the connections of threads (see _get_conn), by thread
+        self._thread_conns: 'weakref.WeakKeyDictionary[threading.Thread, weakref.finalize]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self._thread_conns_lock = threading.Lock()
+        # get_words results (_CachedLookup) by (input_text, max_results), or None if
+        # caching is disabled
+        self._lookup_cache = _make_lru_cache(cache_size) if cache_size > 0 else None
+        # Lookups of single characters, which are the most frequent ones, are kept
+        # apart from the LRU cache: there are few enough of them to keep them all,
+        # and a plain dict avoids the LRU bookkeeping
+        self._char_lookups: Dict[Tuple[str, int], _CachedLookup] = {}
+        self._cache_size = cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Entry data (_CachedEntry) by entry_id, without lookup-specific match information
+        self._entry_cache = _make_lru_cache(cache_size)
         self._connect()
     
     def _connect(self):
         """Connect to the SQLite database."""
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.row_factory = sqlite3.Row
+        # Rows are plain tuples (the default row factory), which are much cheaper to
+        # create and index than sqlite3.Row. get_words reconnects from whichever
+        # thread calls it after close(), and close() may be called from another
+        # thread (see _open_readonly).
+        self.conn = self._open_readonly()
+        self._local.conn = self.conn
+        # Read once per dictionary: older databases need a full scan to compute it
+        if self._max_lookup_length is None:
+            self._max_lookup_length = self._read_max_lookup_length()
+        # Databases built by older versions don't have entry payloads
+        self._has_entry_payloads = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entries_denorm'"
+        ).fetchone() is not None
+        if self._preload_keys and self._known_keys is None:
+            self._known_keys = frozenset(
+                row[0] for row in self.conn.execute(
+                    "SELECT reading_text FROM readings UNION ALL SELECT kanji_text FROM kanji"
+                )
+            )
+    
+    def _read_max_lookup_length(self) -> int:
+        """
+        Get the length of the longest kanji or reading text in the database.
+        
+        No input longer than this can match an entry, so get_words returns early
+        for such inputs without querying. The value is stored in the metadata
+        table at build time; databases built without it compute it here.
+        """
+        try:
+            row = self.conn.execute(
+                "SELECT value FROM metadata WHERE key = 'max_lookup_length'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Older database without a metadata table
+            row = None
+        if row is not None:
+            return int(row[0])
+        
+        row = self.conn.execute("""
+            SELECT MAX(
+                (SELECT MAX(LENGTH(reading_text)) FROM readings),
+                (SELECT MAX(LENGTH(kanji_text)) FROM kanji)
+            )
+        """).fetchone()
+        return row[0] or 0
+    
+    @staticmethod
+    def _configure(conn: sqlite3.Connection):
+        """Tune a connection for lookups: the dictionary only ever reads from the database."""
+        # Reject writes, so nothing can modify the dictionary by accident
+        conn.execute("PRAGMA query_only = 1")
+        # Read the database through a memory map instead of read() calls. The size is
+        # only an upper bound; no more than the file size is mapped.
+        conn.execute("PRAGMA mmap_size = 1073741824")
+        # 64MB page cache (negative values are in KiB)
+        conn.execute("PRAGMA cache_size = -65536")
+        # Sorting for the entry data queries uses temporary B-trees
+        conn.execute("PRAGMA temp_store = MEMORY")
+    
+    def _open_readonly(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection to the database.
+        
+        The database is opened as immutable, so SQLite skips file locking and
+        checking whether the file changed. SQLite allows any number of concurrent
+        readers, so worker threads in lookup_many_parallel each get their own
+        connection.
+        
+        Connections aren't tied to the thread opening them (check_same_thread is
+        off): each is only used by one thread at a time, but may be closed by
+        another one (see close, _get_conn and lookup_many_parallel).
+        """
+        conn = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro&immutable=1",
+            uri=True,
+            check_same_thread=False
+        )
+        self._configure(conn)
+        return conn
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening one if needed.
+        
+        sqlite3 connections can't be used from other threads than the one that
+        opened them, so each thread that looks up words gets its own read-only
+        connection. It is closed once the thread is gone (when its Thread object
+        is garbage collected), or by close() if that comes first, so that servers
+        starting a thread per request don't accumulate connections.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open_readonly()
+            thread = threading.current_thread()
+            with self._thread_conns_lock:
+                self._thread_conns[thread] = weakref.finalize(thread, conn.close)
+            self._local.conn = conn
+        return conn
     
     def close(self):
-        """Close the database connection."""
+        """Close the database connections."""
+        if self._lookup_cache is not None:
+            self._lookup_cache.clear()
+        self._char_lookups.clear()
+        self._entry_cache.clear()
+        with self._thread_conns_lock:
+            for close_conn in list(self._thread_conns.values()):
+                close_conn()
+            self._thread_conns.clear()
+        # Forget the closed connections of all threads
+        self._local = threading.local()
         if self.conn:
             self.conn.close()
             self.conn = None
@@ -94,210 +552,504 @@ class SQLiteDictionary(Dictionary):
                           If None, uses input_text. This is the original input before deinflection.
             
         Returns:
-            List of WordEntry objects matching the input, with matchRange set on matching readings
+            List of WordEntry objects matching the input, with matchRange set on matching readings.
+            The entries are new objects on every call, even for cached lookups.
+        """
+        if not self.conn:
+            self._connect()
+        
+        if not self._may_match(input_text):
+            return []
+        
+        # The matching text only affects the match information, which is set on the
+        # cached entries for each call, so it isn't part of the key
+        key = (input_text, max_results)
+        lookup = self._get_cached_lookup(key)
+        if lookup is None:
+            lookup = self._lookup_one(self._get_conn(), input_text, max_results)
+            self._cache_lookup(key, lookup)
+        return self._matched_entries(lookup, matching_text)
+    
+    def get_words_many(
+        self,
+        inputs: List[str],
+        max_results: int,
+        matching_text: Optional[str] = None
+    ) -> List[List[WordEntry]]:
+        """
+        Look up several words, with the same results as get_words for each.
+        
+        The inputs that aren't cached are looked up with a single query, rather
+        than one per input, and their entries are fetched together.
+        
+        Args:
+            inputs: Texts to look up
+            max_results: Maximum number of results to return per input
+            matching_text: Optional text that was actually matched (see get_words)
+            
+        Returns:
+            List of results, one list of WordEntry objects per input (in input order)
+        """
+        if not self.conn:
+            self._connect()
+        
+        lookups: List[Optional[_CachedLookup]] = []
+        missing: Dict[str, List[int]] = {}
+        for index, input_text in enumerate(inputs):
+            if self._may_match(input_text):
+                lookup = self._get_cached_lookup((input_text, max_results))
+            else:
+                lookup = _CachedLookup(input_text, ())
+            if lookup is None:
+                missing.setdefault(input_text, []).append(index)
+            lookups.append(lookup)
+        
+        if missing:
+            looked_up = self._lookup_many(self._get_conn(), list(missing), max_results)
+            for input_text, lookup in looked_up.items():
+                self._cache_lookup((input_text, max_results), lookup)
+                for index in missing[input_text]:
+                    lookups[index] = lookup
+        
+        return [self._matched_entries(lookup, matching_text) for lookup in lookups]
+    
+    def prefetch_words(self, inputs: Iterable[str], max_results: int):
+        """
+        Look up several words ahead of time, adding the results to the cache.
+        
+        The inputs that aren't cached are looked up together, like in
+        get_words_many, so that later get_words and get_words_many calls for them
+        don't query the database. Nothing is done if caching is disabled.
+        
+        Args:
+            inputs: Texts that will be looked up
+            max_results: Maximum number of results they will be looked up with
         """
         if not self.conn:
             self._connect()
         
-        cursor = self.conn.cursor()
+        if self._lookup_cache is None:
+            return
+        
+        missing = []
+        for input_text in set(inputs):
+            cache = self._char_lookups if len(input_text) == 1 else self._lookup_cache
+            if (input_text, max_results) not in cache and self._may_match(input_text):
+                missing.append(input_text)
+        
+        if missing:
+            # These go to the database, so they count as misses (and the later
+            # lookups of them as hits)
+            self._cache_misses += len(missing)
+            for input_text, lookup in self._lookup_many(self._get_conn(), missing, max_results).items():
+                self._cache_lookup((input_text, max_results), lookup)
+    
+    def cache_info(self) -> CacheInfo:
+        """
+        Get statistics of the get_words cache (also used by get_words_many).
+        
+        Misses are inputs looked up in the database, including by prefetch_words;
+        hits are lookups answered from the cache. Lookups skipped without querying
+        (see preload_keys) are not counted. The counts are approximate if lookups
+        are done from several threads.
+        
+        Returns:
+            CacheInfo with the number of cache hits and misses, the maximum number
+            of cached results (cache_size, not counting single characters) and the
+            number of cached results
+        """
+        currsize = len(self._char_lookups)
+        if self._lookup_cache is not None:
+            currsize += len(self._lookup_cache)
+        return CacheInfo(self._cache_hits, self._cache_misses, self._cache_size, currsize)
+    
+    def _get_cached_lookup(self, key: Tuple[str, int]) -> Optional[_CachedLookup]:
+        """Get a lookup by (input_text, max_results) from the cache, if it is there."""
+        if self._lookup_cache is None:
+            lookup = None
+        elif len(key[0]) == 1:
+            lookup = self._char_lookups.get(key)
+        else:
+            lookup = self._lookup_cache.get(key)
+        
+        if lookup is None:
+            self._cache_misses += 1
+        else:
+            self._cache_hits += 1
+        return lookup
+    
+    def _cache_lookup(self, key: Tuple[str, int], lookup: _CachedLookup):
+        """Add a lookup to the cache (if caching is enabled)."""
+        if self._lookup_cache is None:
+            return
+        if len(key[0]) == 1:
+            self._char_lookups[key] = lookup
+        else:
+            self._lookup_cache[key] = lookup
+    
+    def _may_match(self, input_text: str) -> bool:
+        """Check whether a lookup of input_text can find anything without querying."""
+        # Nothing in the dictionary is longer than this
+        if len(input_text) > self._max_lookup_length:
+            return False
+        
+        # Text that is in neither form (see _lookup_one)
+        known_keys = self._known_keys
+        if (known_keys is not None and input_text not in known_keys
+                and kana_to_hiragana(input_text) not in known_keys):
+            return False
         
-        # Use matching_text if provided, otherwise use input_text
-        # matching_text is what we're matching against (usually the deinflected candidate.word)
-        # This matches 10ten Reader's behavior where matchingText is the input to getWords
-        text_for_match_range = matching_text if matching_text is not None else input_text
+        return True
+    
+    def lookup_many_parallel(
+        self,
+        inputs: Iterable[str],
+        max_results: int,
+        max_workers: Optional[int] = None
+    ) -> List[List[WordEntry]]:
+        """
+        Look up many words concurrently using a pool of worker threads.
+        
+        Each worker thread uses its own read-only connection, and the GIL is
+        released while SQLite executes queries, so bulk lookups (e.g. when
+        processing a large corpus) can use several CPU cores.
+        
+        Args:
+            inputs: Texts to look up
+            max_results: Maximum number of results to return per input
+            max_workers: Number of worker threads. If None, uses os.cpu_count().
+            
+        Returns:
+            List of results, one list of WordEntry objects per input (in input order)
+        """
+        # The pool's threads end with this call, so their connections are closed
+        # here rather than kept until close() (see _get_conn)
+        opened: List[sqlite3.Connection] = []
+        
+        def lookup(input_text: str) -> List[WordEntry]:
+            if getattr(self._local, 'conn', None) is None:
+                conn = self._open_readonly()
+                self._local.conn = conn
+                opened.append(conn)
+            return self.get_words(input_text, max_results)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+                return list(executor.map(lookup, inputs))
+        finally:
+            for conn in opened:
+                conn.close()
+    
+    def _lookup_one(
+        self,
+        conn: sqlite3.Connection,
+        input_text: str,
+        max_results: int
+    ) -> _CachedLookup:
+        """Look up a single word using the given connection (see get_words)."""
+        cursor = conn.cursor()
         
         # Normalize input to hiragana for reading lookup (like 10ten Reader)
         # 10ten Reader normalizes katakana to hiragana before searching when using flat-file DB
         # The SQLite database stores readings in their original form (katakana for loanwords),
         # so we need to search for both original and normalized forms
         normalized_input = kana_to_hiragana(input_text)
-        # Normalize matching text for matchRange calculation (like 10ten Reader's kanaToHiragana)
-        normalized_matching = kana_to_hiragana(text_for_match_range)
         
-        # First, try to find entries by reading (most common case)
+        # Find entries by reading (most common case), falling back to kanji in the same query
         # Try both original input_text (for katakana like "ベッド") and normalized (for hiragana)
         # This matches 10ten Reader's behavior: it normalizes input to hiragana, but database
         # may store readings in original form (katakana), so we search both
-        cursor.execute("""
-            SELECT DISTINCT e.entry_id, e.ent_seq
-            FROM entries e
-            JOIN readings r ON e.entry_id = r.entry_id
-            WHERE r.reading_text = ? OR r.reading_text = ?
-            LIMIT ?
-        """, (input_text, normalized_input, max_results))
+        if normalized_input == input_text:
+            # No katakana in the input (the common case), so there is only one form to search
+            cursor.execute(_ENTRY_IDS_SQL_ONE_FORM, (input_text, max_results))
+        else:
+            cursor.execute(_ENTRY_IDS_SQL_TWO_FORMS, (input_text, normalized_input, max_results))
         
         entry_rows = cursor.fetchall()
         
-        # If no results from reading, try kanji match
-        # Also try both original and normalized for kanji (some kanji entries may be katakana)
         if not entry_rows:
-            cursor.execute("""
-                SELECT DISTINCT e.entry_id, e.ent_seq
-                FROM entries e
-                JOIN kanji k ON e.entry_id = k.entry_id
-                WHERE k.kanji_text = ? OR k.kanji_text = ?
-                LIMIT ?
-            """, (input_text, normalized_input, max_results))
-            entry_rows = cursor.fetchall()
+            return _CachedLookup(normalized_input, ())
         
-        if not entry_rows:
-            return []
+        cached = self._get_cached_entries(cursor, entry_rows)
+        return _CachedLookup(normalized_input, tuple(cached[entry_id] for entry_id, _ in entry_rows))
+    
+    def _lookup_many(
+        self,
+        conn: sqlite3.Connection,
+        inputs: List[str],
+        max_results: int
+    ) -> Dict[str, _CachedLookup]:
+        """Look up several distinct words using the given connection (see get_words_many)."""
+        cursor = conn.cursor()
         
-        # Fetch full entry data for each entry_id
-        entries = []
-        for row in entry_rows:
-            entry_id = row['entry_id']
-            ent_seq = row['ent_seq']
-            
-            # Get kanji readings first to check for kanji match
-            cursor.execute("""
-                SELECT kanji_text, priority, info
-                FROM kanji
-                WHERE entry_id = ?
-                ORDER BY kanji_id
-            """, (entry_id,))
-            kanji_rows = cursor.fetchall()
-            
-            # Determine if we matched on kanji or kana (like 10ten Reader)
-            # Check if any kanji matches the matching_text (normalized)
-            kanji_match_found = False
-            for kanji_row in kanji_rows:
-                if kana_to_hiragana(kanji_row['kanji_text']) == normalized_matching:
-                    kanji_match_found = True
+        normalized_inputs = {input_text: kana_to_hiragana(input_text) for input_text in inputs}
+        texts = list(set(inputs).union(normalized_inputs.values()))
+        
+        # Entries matching each text by reading or kanji, in entry order
+        reading_matches: Dict[str, List[Tuple[int, str]]] = {}
+        kanji_matches: Dict[str, List[Tuple[int, str]]] = {}
+        for chunk, count in _padded_chunks(texts):
+            rows = cursor.execute(_values_sql(_TEXT_MATCHES_SQL_TEMPLATE, count), chunk)
+            # Each text's rows are normally together and in entry order (see
+            # _TEXT_MATCHES_SQL_TEMPLATE), but that depends on the query plan, so
+            # groups of a text seen before are merged rather than overwriting it
+            for (is_kanji, text), text_rows in groupby(rows, key=itemgetter(0, 1)):
+                matches = kanji_matches if is_kanji else reading_matches
+                text_matches = [(entry_id, ent_seq) for _, _, entry_id, ent_seq in text_rows]
+                earlier_matches = matches.get(text)
+                if earlier_matches is None:
+                    matches[text] = text_matches
+                else:
+                    earlier_matches.extend(text_matches)
+                    earlier_matches.sort()
+        
+        # Pick each input's entries like _ENTRY_IDS_SQL_ONE_FORM/_TWO_FORMS: readings
+        # first, then kanji, going through the forms in index (sorted) order
+        entry_rows_by_input = {}
+        for input_text, normalized_input in normalized_inputs.items():
+            # Most inputs have a single form
+            single_form = input_text == normalized_input
+            if not single_form:
+                forms = sorted((input_text, normalized_input))
+            entry_rows: List[Tuple[int, str]] = []
+            for matches in (reading_matches, kanji_matches):
+                if single_form:
+                    rows = matches.get(input_text)
+                else:
+                    rows = [row for form in forms for row in matches.get(form, ())]
+                if not rows:
+                    continue
+                # Drop repeated entries (an entry's row is always the same), keeping
+                # the first occurrence
+                entry_rows = list(dict.fromkeys(rows))
+                if max_results >= 0:
+                    # (A negative LIMIT means no limit in SQLite)
+                    del entry_rows[max_results:]
+                if entry_rows:
                     break
+            entry_rows_by_input[input_text] = entry_rows
+        
+        # Fetch the entries of all inputs together
+        cached = self._get_cached_entries(cursor, list({
+            row[0]: row for entry_rows in entry_rows_by_input.values() for row in entry_rows
+        }.values()))
+        
+        return {
+            input_text: _CachedLookup(
+                normalized_inputs[input_text],
+                tuple(cached[entry_id] for entry_id, _ in entry_rows)
+            )
+            for input_text, entry_rows in entry_rows_by_input.items()
+        }
+    
+    def _get_cached_entries(
+        self,
+        cursor: sqlite3.Cursor,
+        entry_rows: List[Tuple[int, str]]
+    ) -> Dict[int, _CachedEntry]:
+        """
+        Get the data of the given entries, from the entry cache or the database.
+        
+        Args:
+            cursor: Cursor to run the queries on
+            entry_rows: (entry_id, ent_seq) rows
             
-            # Get kana readings to check for kana match
-            cursor.execute("""
-                SELECT reading_text, no_kanji, priority, info
-                FROM readings
-                WHERE entry_id = ?
-                ORDER BY reading_id
-            """, (entry_id,))
-            kana_rows = cursor.fetchall()
-            
-            # Check if any kana matches (only if no kanji match, like 10ten Reader)
-            # 10ten Reader compares kanaToHiragana(entry_reading) === matchingText (which is already hiragana)
-            # So we normalize both sides to hiragana for comparison
-            kana_match_found = False
-            if not kanji_match_found:
-                for kana_row in kana_rows:
-                    kana_text = kana_row['reading_text']
-                    # Normalize entry reading to hiragana and compare with normalized_matching (already hiragana)
-                    if kana_to_hiragana(kana_text) == normalized_matching:
-                        kana_match_found = True
-                        break
-            
-            # Build kanji readings with matchRange (like 10ten Reader)
-            kanji_readings = []
-            for kanji_row in kanji_rows:
-                kanji_text = kanji_row['kanji_text']
-                kanji_normalized = kana_to_hiragana(kanji_text)
-                # Check if this kanji matches the matching_text (normalized)
-                matches = kanji_normalized == normalized_matching
-                
-                kanji_readings.append(KanjiReading(
-                    text=kanji_text,
-                    priority=kanji_row['priority'],
-                    info=kanji_row['info'],
-                    match_range=(0, len(kanji_text)) if matches else None,
-                    match=(kanji_match_found and matches) or not kanji_match_found
-                ))
-            
-            # Build kana readings with matchRange (like 10ten Reader)
-            # 10ten Reader compares: kanaToHiragana(key) === matchingText (both normalized to hiragana)
-            kana_readings = []
-            for kana_row in kana_rows:
-                kana_text = kana_row['reading_text']
-                # Normalize entry reading to hiragana and compare with normalized_matching (already hiragana)
-                matches = kana_to_hiragana(kana_text) == normalized_matching
-                
-                kana_readings.append(KanaReading(
-                    text=kana_text,
-                    no_kanji=bool(kana_row['no_kanji']),
-                    priority=kana_row['priority'],
-                    info=kana_row['info'],
-                    match_range=(0, len(kana_text)) if matches else None,
-                    match=(kana_match_found and matches) or not kana_match_found
-                ))
-            
-            # Get senses with POS tags
-            cursor.execute("""
-                SELECT s.sense_id, s.sense_index, s.info
-                FROM senses s
-                WHERE s.entry_id = ?
-                ORDER BY s.sense_index
-            """, (entry_id,))
-            sense_rows = cursor.fetchall()
-            
-            senses = []
-            for sense_row in sense_rows:
-                sense_id = sense_row['sense_id']
-                
-                # Get POS tags for this sense
-                cursor.execute("""
-                    SELECT pos
-                    FROM sense_pos
-                    WHERE sense_id = ?
-                """, (sense_id,))
-                pos_tags = [row['pos'] for row in cursor.fetchall()]
-                
-                # Get glosses for this sense
-                cursor.execute("""
-                    SELECT gloss_text, lang, g_type
-                    FROM glosses
-                    WHERE sense_id = ?
-                    ORDER BY gloss_id
-                """, (sense_id,))
-                glosses = [
-                    Gloss(
-                        text=row['gloss_text'],
-                        lang=row['lang'] or 'eng',
-                        g_type=row['g_type']
-                    )
-                    for row in cursor.fetchall()
-                ]
-                
-                # Get optional metadata (if available)
-                cursor.execute("""
-                    SELECT field
-                    FROM sense_field
-                    WHERE sense_id = ?
-                """, (sense_id,))
-                fields = [row['field'] for row in cursor.fetchall()] or None
-                
-                cursor.execute("""
-                    SELECT misc
-                    FROM sense_misc
-                    WHERE sense_id = ?
-                """, (sense_id,))
-                misc = [row['misc'] for row in cursor.fetchall()] or None
-                
-                cursor.execute("""
-                    SELECT dial
-                    FROM sense_dial
-                    WHERE sense_id = ?
-                """, (sense_id,))
-                dial = [row['dial'] for row in cursor.fetchall()] or None
-                
-                senses.append(Sense(
-                    index=sense_row['sense_index'],
-                    pos_tags=pos_tags,
-                    glosses=glosses,
-                    info=sense_row['info'],
-                    field=fields,
-                    misc=misc,
-                    dial=dial
-                ))
+        Returns:
+            Dictionary of _CachedEntry objects by entry_id
+        """
+        # Entry data doesn't depend on the lookup, so it is shared between lookups
+        cached = {}
+        missing_rows = []
+        for row in entry_rows:
+            cached_entry = self._entry_cache.get(row[0])
+            if cached_entry is None:
+                missing_rows.append(row)
+            else:
+                cached[row[0]] = cached_entry
+        
+        if missing_rows:
+            for entry_id, entry in self._fetch_entries(cursor, missing_rows).items():
+                # Normalize the readings once, rather than on every match (see _set_match_range)
+                cached_entry = _CachedEntry(
+                    entry,
+                    tuple(sys.intern(kana_to_hiragana(kanji.text)) for kanji in entry.kanji_readings),
+                    tuple(sys.intern(kana_to_hiragana(kana.text)) for kana in entry.kana_readings)
+                )
+                self._entry_cache[entry_id] = cached_entry
+                cached[entry_id] = cached_entry
+        
+        return cached
+    
+    def _matched_entries(self, lookup: _CachedLookup, matching_text: Optional[str]) -> List[WordEntry]:
+        """Get the entries of a lookup with match information for the given matching text."""
+        if not lookup.entries:
+            return []
+        normalized_matching = _normalize_matching(lookup.normalized_input, matching_text)
+        return [self._set_match_range(cached_entry, normalized_matching) for cached_entry in lookup.entries]
+    
+    def _fetch_entries(
+        self,
+        cursor: sqlite3.Cursor,
+        entry_rows: List[Tuple[int, str]]
+    ) -> Dict[int, WordEntry]:
+        """
+        Fetch the readings and senses of several entries from the database.
+        
+        All the data is fetched with a single query (rather than one per table,
+        entry or sense), from the entry payloads if the database has them. The
+        match/match_range fields of the readings are left unset since they depend
+        on the lookup; see _set_match_range.
+        
+        Args:
+            cursor: Cursor to run the queries on
+            entry_rows: (entry_id, ent_seq) rows
             
-            entries.append(WordEntry(
+        Returns:
+            Dictionary of WordEntry objects without match information, by entry_id
+        """
+        entry_ids = [entry_id for entry_id, _ in entry_rows]
+        
+        if self._has_entry_payloads:
+            ent_seqs = dict(entry_rows)
+            entries = {}
+            for chunk, count in _padded_chunks(entry_ids):
+                rows = cursor.execute(_values_sql(_ENTRY_PAYLOADS_SQL_TEMPLATE, count), chunk)
+                for entry_id, payload in rows:
+                    entries[entry_id] = _entry_from_payload(entry_id, ent_seqs[entry_id], payload)
+            return entries
+        
+        kanji_readings = defaultdict(list)
+        kana_readings = defaultdict(list)
+        senses = defaultdict(list)
+        pos_tags = defaultdict(list)
+        glosses = defaultdict(list)
+        fields = defaultdict(list)
+        misc = defaultdict(list)
+        dial = defaultdict(list)
+        
+        for chunk, count in _padded_chunks(entry_ids):
+            # The rows are streamed from the cursor rather than fetched into a list
+            # first. They are sorted by table, so each table's rows are handled by
+            # their own loop rather than dispatched one by one. The 's' rows come
+            # after the sense data they refer to.
+            rows = cursor.execute(_values_sql(_ENTRY_DATA_SQL_TEMPLATE, count), chunk)
+            for tag, table_rows in groupby(rows, key=itemgetter(0)):
+                if tag == 'g':
+                    for _, sense_id, text, lang, g_type, _, _ in table_rows:
+                        glosses[sense_id].append(Gloss(text=text, lang=lang or 'eng', g_type=g_type))
+                elif tag == 'p':
+                    for _, sense_id, pos, _, _, _, _ in table_rows:
+                        pos_tags[sense_id].append(pos)
+                elif tag == 'k':
+                    for _, entry_id, text, priority, info, _, _ in table_rows:
+                        kanji_readings[entry_id].append(KanjiReading(
+                            text=text,
+                            priority=priority,
+                            info=info
+                        ))
+                elif tag == 'r':
+                    for _, entry_id, text, priority, info, no_kanji, _ in table_rows:
+                        kana_readings[entry_id].append(KanaReading(
+                            text=text,
+                            no_kanji=bool(no_kanji),
+                            priority=priority,
+                            info=info
+                        ))
+                elif tag == 's':
+                    for _, entry_id, sense_id, info, _, _, sense_index in table_rows:
+                        senses[entry_id].append(Sense(
+                            index=sense_index,
+                            pos_tags=pos_tags.get(sense_id, []),
+                            glosses=glosses.get(sense_id, []),
+                            info=info,
+                            field=fields.get(sense_id),
+                            misc=misc.get(sense_id),
+                            dial=dial.get(sense_id)
+                        ))
+                # Optional metadata (if available)
+                elif tag == 'f':
+                    for _, sense_id, field, _, _, _, _ in table_rows:
+                        fields[sense_id].append(field)
+                elif tag == 'm':
+                    for _, sense_id, misc_tag, _, _, _, _ in table_rows:
+                        misc[sense_id].append(misc_tag)
+                elif tag == 'd':
+                    for _, sense_id, dial_tag, _, _, _, _ in table_rows:
+                        dial[sense_id].append(dial_tag)
+        
+        return {
+            entry_id: WordEntry(
                 entry_id=entry_id,
                 ent_seq=ent_seq,
-                kanji_readings=kanji_readings,
-                kana_readings=kana_readings,
-                senses=senses
+                kanji_readings=kanji_readings.get(entry_id, []),
+                kana_readings=kana_readings.get(entry_id, []),
+                senses=senses.get(entry_id, [])
+            )
+            for entry_id, ent_seq in entry_rows
+        }
+    
+    def _set_match_range(self, cached_entry: _CachedEntry, normalized_matching: str) -> WordEntry:
+        """
+        Copy an entry with match and match_range set on its readings.
+        
+        The whole entry is copied (readings, senses and glosses), so the results of
+        a lookup share nothing with the cache or with other lookups' results.
+        
+        Args:
+            cached_entry: Entry without match information (from _fetch_entries), with
+                          its normalized readings
+            normalized_matching: Matching text normalized to hiragana
+            
+        Returns:
+            New WordEntry with matchRange set on matching readings
+        """
+        entry = cached_entry.entry
+        
+        # Determine if we matched on kanji or kana (like 10ten Reader)
+        # Check if any kanji matches the matching_text (normalized)
+        kanji_match_found = normalized_matching in cached_entry.kanji_normalized
+        
+        # Check if any kana matches (only if no kanji match, like 10ten Reader)
+        # 10ten Reader compares kanaToHiragana(entry_reading) === matchingText (which is already hiragana)
+        # So we normalize both sides to hiragana for comparison
+        kana_match_found = not kanji_match_found and normalized_matching in cached_entry.kana_normalized
+        
+        # Build kanji readings with matchRange (like 10ten Reader). If none matched,
+        # all of them are marked as matching.
+        kanji_readings = []
+        for kanji, normalized in zip(entry.kanji_readings, cached_entry.kanji_normalized):
+            matched = kanji_match_found and normalized == normalized_matching
+            kanji_readings.append(KanjiReading(
+                text=kanji.text,
+                priority=kanji.priority,
+                info=kanji.info,
+                match_range=(0, len(kanji.text)) if matched else None,
+                match=matched or not kanji_match_found
+            ))
+        
+        # Build kana readings with matchRange (like 10ten Reader)
+        # 10ten Reader compares: kanaToHiragana(key) === matchingText (both normalized to hiragana)
+        # When the match was on kanji, kana readings that happen to match still get a
+        # matchRange, and all of them are marked as matching.
+        kana_readings = []
+        for kana, normalized in zip(entry.kana_readings, cached_entry.kana_normalized):
+            matched = normalized == normalized_matching
+            kana_readings.append(KanaReading(
+                text=kana.text,
+                no_kanji=kana.no_kanji,
+                priority=kana.priority,
+                info=kana.info,
+                match_range=(0, len(kana.text)) if matched else None,
+                match=matched or not kana_match_found
             ))
         
-        return entries
+        return WordEntry(
+            entry_id=entry.entry_id,
+            ent_seq=entry.ent_seq,
+            kanji_readings=kanji_readings,
+            kana_readings=kana_readings,
+            senses=[_copy_sense(sense) for sense in entry.senses]
+        )
     
     def __enter__(self):
         """Context manager entry."""
@@ -2,13 +2,74 @@
 Tests for dictionary interface.
 """
 
+import gc
+import os
 import unittest
+import sqlite3
 import sys
+import tempfile
+import threading
 from pathlib import Path
+from unittest import mock
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from tentoku import SQLiteDictionary
+from tentoku import SQLiteDictionary, tokenize
+from tentoku import sqlite_dict
+from tentoku.normalize import kana_to_hiragana
+
+
+# Tables holding the data of entries (see copy_entries)
+ENTRY_TABLES = [
+    'entries', 'kanji', 'readings', 'senses',
+    'sense_pos', 'glosses', 'sense_field', 'sense_misc', 'sense_dial'
+]
+
+
+def copy_entries(db_path, dest_path, words, tables):
+    """
+    Copy the entries matching some words into a new database with only some tables.
+    
+    Used to test databases built by older versions, without the newer tables.
+    
+    Args:
+        db_path: Database to copy from
+        dest_path: Path of the new database
+        words: Words whose entries (by reading or kanji, in either kana form) are copied
+        tables: Tables to create (with their indexes) and copy the rows of
+    """
+    texts = sorted(set(words) | {kana_to_hiragana(word) for word in words})
+    placeholders = ', '.join('?' * len(texts))
+    conn = sqlite3.connect(dest_path)
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (db_path,))
+        schema = conn.execute(
+            f"SELECT type, sql FROM src.sqlite_master WHERE sql IS NOT NULL"
+            f" AND tbl_name IN ({', '.join('?' * len(tables))})",
+            tables
+        ).fetchall()
+        for object_type in ('table', 'index'):
+            for sql_type, sql in schema:
+                if sql_type == object_type:
+                    conn.execute(sql)
+        
+        conn.execute(f"""
+            CREATE TEMP TABLE ids AS
+            SELECT entry_id FROM src.readings WHERE reading_text IN ({placeholders})
+            UNION
+            SELECT entry_id FROM src.kanji WHERE kanji_text IN ({placeholders})
+        """, texts + texts)
+        for table in tables:
+            if table in ('entries', 'kanji', 'readings', 'senses'):
+                condition = "WHERE entry_id IN (SELECT entry_id FROM temp.ids)"
+            elif table.startswith('sense_') or table == 'glosses':
+                condition = "WHERE sense_id IN (SELECT sense_id FROM main.senses)"
+            else:
+                condition = ""
+            conn.execute(f"INSERT INTO main.{table} SELECT * FROM src.{table} {condition}")
+        conn.commit()
+    finally:
+        conn.close()
 
 
 class TestDictionary(unittest.TestCase):
@@ -107,6 +168,276 @@ class TestDictionary(unittest.TestCase):
         """Test lookup with empty string."""
         entries = self.dictionary.get_words("", max_results=5)
         self.assertEqual(len(entries), 0)
+    
+    def test_get_words_cached(self):
+        """Test that repeated lookups return equal results from the cache."""
+        first = self.dictionary.get_words("食べる", max_results=5)
+        first.clear()
+        second = self.dictionary.get_words("食べる", max_results=5)
+        self.assertGreater(len(second), 0)
+        
+        # Cache hits are copies, not the cached objects themselves
+        third = self.dictionary.get_words("食べる", max_results=5)
+        self.assertEqual(third, second)
+        self.assertIsNot(third[0], second[0])
+        self.assertIsNot(third[0].senses, second[0].senses)
+        
+        uncached = SQLiteDictionary(self.db_path, cache_size=0)
+        try:
+            self.assertEqual(uncached.get_words("食べる", max_results=5), second)
+        finally:
+            uncached.close()
+    
+    def test_get_words_results_are_copies(self):
+        """Test that modifying returned entries doesn't affect later lookups."""
+        entry = self.dictionary.get_words("食べる", max_results=5)[0]
+        expected_senses = len(entry.senses)
+        self.assertGreater(expected_senses, 0)
+        entry.senses[0].glosses.clear()
+        entry.senses.clear()
+        entry.kana_readings[0].match = False
+        entry.kana_readings.clear()
+        
+        for matching_text in (None, "たべる", "食べ"):
+            again = self.dictionary.get_words("食べる", max_results=5, matching_text=matching_text)[0]
+            self.assertEqual(len(again.senses), expected_senses)
+            self.assertGreater(len(again.senses[0].glosses), 0)
+            self.assertGreater(len(again.kana_readings), 0)
+        
+        tokens = tokenize("食べる", self.dictionary)
+        self.assertEqual(len(tokens[0].dictionary_entry.senses), expected_senses)
+        self.assertIsNot(tokens[0].dictionary_entry.senses[0], again.senses[0])
+    
+    def test_cache_info(self):
+        """Test that cache_info counts cache hits and misses."""
+        self.dictionary.get_words("食べる", max_results=5)
+        self.dictionary.get_words("食べる", max_results=5, matching_text="食べ")
+        self.dictionary.get_words("食", max_results=5)
+        self.dictionary.get_words("食", max_results=5)
+        info = self.dictionary.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 2, 2))
+        self.assertEqual(info.maxsize, 10000)
+        
+        uncached = SQLiteDictionary(self.db_path, cache_size=0)
+        try:
+            uncached.get_words("食", max_results=5)
+            uncached.get_words("食", max_results=5)
+            self.assertEqual(uncached.cache_info(), (0, 2, 0, 0))
+        finally:
+            uncached.close()
+    
+    def test_get_words_many(self):
+        """Test that batched lookups match individual lookups."""
+        words = ["食べる", "ベッド", "べっど", "xxxxxxxx", "学生", "がくせい", "食べる", "ロー", ""]
+        uncached = SQLiteDictionary(self.db_path, cache_size=0)
+        try:
+            results = uncached.get_words_many(words, max_results=3, matching_text="たべる")
+        finally:
+            uncached.close()
+        self.assertEqual(len(results), len(words))
+        for word, entries in zip(words, results):
+            self.assertEqual(
+                entries,
+                self.dictionary.get_words(word, max_results=3, matching_text="たべる")
+            )
+    
+    def test_prefetch_words(self):
+        """Test that prefetched words are looked up from the cache."""
+        words = ["食べる", "ベッド", "xxxxxxxx", "学生", "食"]
+        self.dictionary.prefetch_words(words, max_results=5)
+        info = self.dictionary.cache_info()
+        # Each word was looked up in the database once
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, len(words), len(words)))
+        self.dictionary.prefetch_words(words, max_results=5)
+        self.assertEqual(self.dictionary.cache_info(), info)
+        
+        uncached = SQLiteDictionary(self.db_path, cache_size=0)
+        try:
+            for word in words:
+                self.assertEqual(
+                    self.dictionary.get_words(word, max_results=5),
+                    uncached.get_words(word, max_results=5)
+                )
+        finally:
+            uncached.close()
+        self.assertEqual(
+            self.dictionary.cache_info()[:2],
+            (info.hits + len(words), info.misses)
+        )
+    
+    def test_get_words_preload_keys(self):
+        """Test that preloading keys doesn't change lookup results."""
+        preloaded = SQLiteDictionary(self.db_path, preload_keys=True)
+        try:
+            for word in ["食べる", "ベッド", "べっど", "xxxxxxxx", "学生です"]:
+                self.assertEqual(
+                    preloaded.get_words(word, max_results=5),
+                    self.dictionary.get_words(word, max_results=5)
+                )
+        finally:
+            preloaded.close()
+    
+    def test_lookup_many_parallel(self):
+        """Test that parallel lookups match sequential lookups."""
+        words = ["食べる", "する", "ベッド", "xxxxxxxx", "学生", "です"] * 3
+        results = self.dictionary.lookup_many_parallel(words, max_results=5, max_workers=4)
+        self.assertEqual(len(results), len(words))
+        for word, entries in zip(words, results):
+            expected = self.dictionary.get_words(word, max_results=5)
+            self.assertEqual(
+                [e.entry_id for e in entries],
+                [e.entry_id for e in expected]
+            )
+    
+    def test_lookup_many_parallel_without_lru_dict(self):
+        """Test parallel lookups with the pure-Python LRU cache and constant evictions."""
+        words = [row[0] for row in self.dictionary.conn.execute(
+            "SELECT DISTINCT reading_text FROM readings ORDER BY reading_id LIMIT 3000"
+        )] * 2
+        switch_interval = sys.getswitchinterval()
+        with mock.patch.object(sqlite_dict, 'HAS_LRU_DICT', False):
+            small_cache = SQLiteDictionary(self.db_path, cache_size=4)
+        # Switch threads as often as possible, to interleave the cache updates
+        sys.setswitchinterval(1e-6)
+        try:
+            results = small_cache.lookup_many_parallel(words, max_results=3, max_workers=16)
+        finally:
+            sys.setswitchinterval(switch_interval)
+            small_cache.close()
+        self.assertEqual(len(results), len(words))
+        for word, entries in list(zip(words, results))[::300]:
+            self.assertEqual(entries, self.dictionary.get_words(word, max_results=3))
+    
+    def test_get_words_from_other_threads(self):
+        """Test lookups from threads other than the one that opened the dictionary."""
+        expected = self.dictionary.get_words("学生", max_results=5)
+        
+        # Without a cache, each thread queries the database with its own connection
+        uncached = SQLiteDictionary(self.db_path, cache_size=0)
+        results = []
+        
+        def lookup():
+            results.append(uncached.get_words("学生", max_results=5))
+        
+        try:
+            threads = [threading.Thread(target=lookup) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(uncached.cache_info().misses, 3)
+        finally:
+            uncached.close()
+        
+        self.assertEqual(len(results), 3)
+        for entries in results:
+            self.assertEqual(entries, expected)
+    
+    def test_thread_connections_closed_with_threads(self):
+        """Test that connections of finished threads don't stay open."""
+        if not os.path.isdir('/proc/self/fd'):
+            self.skipTest("Open file descriptors can't be counted")
+        uncached = SQLiteDictionary(self.db_path, cache_size=0)
+        try:
+            open_files = len(os.listdir('/proc/self/fd'))
+            threads = [
+                threading.Thread(target=uncached.get_words, args=("学生", 5))
+                for _ in range(20)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            del threads, thread
+            gc.collect()
+            self.assertLessEqual(len(os.listdir('/proc/self/fd')), open_files)
+            
+            # The dictionary still works from new threads
+            results = []
+            thread = threading.Thread(target=lambda: results.append(uncached.get_words("学生", 5)))
+            thread.start()
+            thread.join()
+            self.assertEqual(results[0], self.dictionary.get_words("学生", 5))
+        finally:
+            uncached.close()
+    
+    def test_reconnect_from_other_thread(self):
+        """Test closing after another thread reconnected a closed dictionary."""
+        expected = self.dictionary.get_words("学生", max_results=5)
+        self.dictionary.close()
+        
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(self.dictionary.get_words("学生", max_results=5))
+        )
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [expected])
+        
+        self.dictionary.close()
+        self.assertEqual(self.dictionary.get_words("学生", max_results=5), expected)
+    
+    def test_connection_is_query_only(self):
+        """Test that the dictionary connection rejects writes."""
+        with self.assertRaises(sqlite3.OperationalError):
+            self.dictionary.conn.execute("DELETE FROM entries WHERE entry_id = -1")
+    
+    def test_get_words_many_large_batch(self):
+        """Test looking up more entries than fit in a single query."""
+        texts = [row[0] for row in self.dictionary.conn.execute(
+            "SELECT DISTINCT reading_text FROM readings ORDER BY reading_id LIMIT 1200"
+        )]
+        uncached = SQLiteDictionary(self.db_path, cache_size=0)
+        try:
+            results = uncached.get_words_many(texts, max_results=1)
+        finally:
+            uncached.close()
+        self.assertEqual(len(results), len(texts))
+        for text, entries in zip(texts[::100], results[::100]):
+            self.assertEqual(entries, self.dictionary.get_words(text, max_results=1))
+            self.assertGreater(len(entries[0].kana_readings), 0)
+            self.assertGreater(len(entries[0].senses), 0)
+    
+    def test_get_words_without_entry_payloads(self):
+        """Test that a database without entry payloads gives the same results."""
+        words = ["食べる", "学生", "ベッド", "する", "見る", "日本", "ロー"]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = str(Path(tmp_dir) / "jmdict.db")
+            copy_entries(self.db_path, db_path, words, ENTRY_TABLES + ['metadata'])
+            old_dictionary = SQLiteDictionary(db_path, auto_build=False, cache_size=0)
+            try:
+                for word in words:
+                    self.assertEqual(
+                        old_dictionary.get_words(word, max_results=20),
+                        self.dictionary.get_words(word, max_results=20)
+                    )
+            finally:
+                old_dictionary.close()
+    
+    def test_get_words_without_metadata(self):
+        """Test a database built before the metadata table existed."""
+        words = ["食べる", "学生", "ベッド"]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = str(Path(tmp_dir) / "jmdict.db")
+            copy_entries(self.db_path, db_path, words, ENTRY_TABLES)
+            old_dictionary = SQLiteDictionary(db_path, auto_build=False, cache_size=0)
+            try:
+                for word in words:
+                    self.assertEqual(
+                        old_dictionary.get_words(word, max_results=20),
+                        self.dictionary.get_words(word, max_results=20)
+                    )
+                # Longer than any text in the copied entries
+                self.assertEqual(old_dictionary.get_words("食べる学生", max_results=20), [])
+                
+                # Lookups still work after reconnecting
+                old_dictionary.close()
+                self.assertEqual(
+                    old_dictionary.get_words("学生", max_results=20),
+                    self.dictionary.get_words("学生", max_results=20)
+                )
+            finally:
+                old_dictionary.close()
 
 
 if __name__ == '__main__':
@@ -9,7 +9,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from tentoku.normalize import (
-    normalize_input, kana_to_hiragana, half_to_full_width_num
+    normalize_input, kana_to_hiragana, half_to_full_width_num, has_katakana
 )
 
 
@@ -79,6 +79,17 @@ class TestNormalize(unittest.TestCase):
         self.assertEqual(kana_to_hiragana("ヹ"), "ゑ")
         self.assertEqual(kana_to_hiragana("ヺ"), "を")
     
+    def test_has_katakana(self):
+        """Test katakana detection."""
+        self.assertTrue(has_katakana("ベッド"))
+        self.assertTrue(has_katakana("東京タワー"))
+        self.assertTrue(has_katakana("ヺ"))
+        self.assertFalse(has_katakana("ひらがな"))
+        self.assertFalse(has_katakana("日本語"))
+        # The long vowel mark is not converted by kana_to_hiragana
+        self.assertFalse(has_katakana("ー"))
+        self.assertFalse(has_katakana(""))
+    
     def test_half_to_full_width_num(self):
         """Test half-width to full-width number conversion."""
         self.assertEqual(half_to_full_width_num("123"), "１２３")
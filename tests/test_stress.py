@@ -3,8 +3,10 @@ Stress and performance tests.
 """
 
 import unittest
+import statistics
 import sys
 import time
+import timeit
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -12,6 +14,25 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from tentoku import SQLiteDictionary, tokenize
 
 
+def median_time(func, warmup: int = 1, repeats: int = 5) -> float:
+    """
+    Time func in steady state: the median of several calls, after warmup calls.
+    
+    A single timing is easily thrown off by a cold page cache or a busy machine.
+    
+    Args:
+        func: Function to time (called without arguments)
+        warmup: Number of untimed calls first
+        repeats: Number of timed calls
+        
+    Returns:
+        Median time of a call in seconds
+    """
+    for _ in range(warmup):
+        func()
+    return statistics.median(timeit.repeat(func, number=1, repeat=repeats))
+
+
 class TestStress(unittest.TestCase):
     """Stress and performance tests."""
     
@@ -26,30 +47,34 @@ class TestStress(unittest.TestCase):
         
         cls.db_path = str(db_path)
         cls.dictionary = SQLiteDictionary(db_path=cls.db_path)
+        # Performance tests are timed without the lookup cache, so that repeated
+        # calls measure tokenization rather than cache hits (warmup calls only warm
+        # the SQLite and OS page caches)
+        cls.uncached_dictionary = SQLiteDictionary(db_path=cls.db_path, cache_size=0)
     
     @classmethod
     def tearDownClass(cls):
-        """Close database connection."""
+        """Close database connections."""
         if hasattr(cls, 'dictionary'):
             cls.dictionary.close()
+        if hasattr(cls, 'uncached_dictionary'):
+            cls.uncached_dictionary.close()
     
     def test_tokenize_performance_simple(self):
         """Test that simple tokenization completes in reasonable time."""
         text = "こんにちは"
-        start = time.perf_counter()
         tokens = tokenize(text, self.dictionary)
-        elapsed = time.perf_counter() - start
         self.assertIsInstance(tokens, list)
+        elapsed = median_time(lambda: tokenize(text, self.uncached_dictionary))
         # Should complete in under 100ms for simple text
         self.assertLess(elapsed, 0.1, f"Tokenization took {elapsed*1000:.2f}ms, expected < 100ms")
     
     def test_tokenize_performance_complex(self):
         """Test that complex tokenization completes in reasonable time."""
         text = "食べさせられませんでした"
-        start = time.perf_counter()
         tokens = tokenize(text, self.dictionary)
-        elapsed = time.perf_counter() - start
         self.assertIsInstance(tokens, list)
+        elapsed = median_time(lambda: tokenize(text, self.uncached_dictionary))
         # Should complete in under 500ms for complex text
         self.assertLess(elapsed, 0.5, f"Tokenization took {elapsed*1000:.2f}ms, expected < 500ms")
     
@@ -78,10 +103,9 @@ class TestStress(unittest.TestCase):
     def test_tokenize_performance_long_text(self):
         """Test that long text tokenization completes in reasonable time."""
         text = "私は毎日日本語を勉強しています。今日は新しい単語を覚えました。明日も続けます。" * 5
-        start = time.perf_counter()
         tokens = tokenize(text, self.dictionary)
-        elapsed = time.perf_counter() - start
         self.assertIsInstance(tokens, list)
+        elapsed = median_time(lambda: tokenize(text, self.uncached_dictionary), repeats=3)
         # Should complete in under 2 seconds for long text
         # Updated: Allow slightly more time (2.5s) to account for getting multiple results
         # to find longest match with deinflection_reasons
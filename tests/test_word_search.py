@@ -9,8 +9,29 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from tentoku.word_search import word_search
-from tentoku import SQLiteDictionary
-from tentoku._types import Reason
+from tentoku import Dictionary, SQLiteDictionary
+from tentoku._types import Reason, WordEntry, KanaReading
+
+
+class CountingDictionary(Dictionary):
+    """Dictionary finding a new entry for every input, counting lookups and prefetches."""
+    
+    def __init__(self):
+        self.looked_up = 0
+        self.prefetched = 0
+    
+    def get_words(self, input_text, max_results, matching_text=None):
+        self.looked_up += 1
+        return [WordEntry(
+            entry_id=self.looked_up,
+            ent_seq=str(self.looked_up),
+            kanji_readings=[],
+            kana_readings=[KanaReading(text=input_text)],
+            senses=[]
+        )]
+    
+    def prefetch_words(self, inputs, max_results):
+        self.prefetched += len(list(inputs))
 
 
 class TestWordSearch(unittest.TestCase):
@@ -444,6 +465,18 @@ class TestWordSearch(unittest.TestCase):
         if doujiru_pos is not None:
             self.assertGreater(doujiru_pos, 0)
 
+    
+    def test_early_exit_limits_prefetching(self):
+        """Test that candidates of prefixes the search never reaches aren't prefetched."""
+        dictionary = CountingDictionary()
+        # Every prefix matches, so the search stops after 10 prefixes (10 * max_results
+        # results) out of 200
+        result = word_search('あ' * 200, dictionary, max_results=1)
+        self.assertIsNotNone(result)
+        self.assertEqual(result.match_len, 200)
+        self.assertGreater(dictionary.prefetched, 0)
+        self.assertLessEqual(dictionary.prefetched, 3 * dictionary.looked_up)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,9 +5,9 @@ This module implements the backtracking word search algorithm that finds
 the longest matching words in text, handling deinflection and variations.
 """
 
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 from .dictionary import Dictionary
-from ._types import WordResult, WordEntry, Reason
+from ._types import CandidateWord, WordResult, WordEntry, Reason
 from .deinflect import deinflect
 from .type_matching import entry_matches_type
 from .sorting import sort_word_results
@@ -16,6 +16,11 @@ from .yoon import ends_in_yoon
 from .normalize import normalize_input
 
 
+# Number of prefixes word_search deinflects and prefetches at first; each further
+# window is twice as large
+_INITIAL_PREFETCH_WINDOW = 8
+
+
 class WordSearchResult:
     """Result from word search."""
     
@@ -58,6 +63,29 @@ def is_only_digits(text: str) -> bool:
     return True
 
 
+def get_variations(text: str) -> List[str]:
+    """
+    Get the text and its variations to look up.
+    
+    Args:
+        text: Text to get variations of
+        
+    Returns:
+        List of the text followed by its variations
+    """
+    variations = [text]
+    
+    # Expand ー to its various possibilities
+    variations.extend(expand_choon(text))
+    
+    # See if there are any 旧字体 we can convert to 新字体
+    to_new = kyuujitai_to_shinjitai(text)
+    if to_new != text:
+        variations.append(to_new)
+    
+    return variations
+
+
 def word_search(
     input_text: str,
     dictionary: Dictionary,
@@ -95,6 +123,12 @@ def word_search(
     else:
         normalized = input_text
     
+    # Deinflected prefixes (and variations) and the variations of each prefix,
+    # filled in windows by prefetch_prefixes
+    prefix_candidates: Dict[str, List[CandidateWord]] = {}
+    prefix_variations: Dict[str, List[str]] = {}
+    prefetch_window = _INITIAL_PREFETCH_WINDOW
+    
     current_input = normalized
     
     while current_input:
@@ -102,17 +136,29 @@ def word_search(
         if is_only_digits(current_input):
             break
         
-        variations = [current_input]
+        # Deinflect the next few prefixes to be tried, and let the dictionary look up
+        # their candidates together rather than one prefix at a time. The window
+        # grows as the search goes on, so that an early exit (or a match, after
+        # which only that variation's prefixes are tried) wastes little work.
+        if current_input not in prefix_candidates:
+            prefetch_prefixes(
+                current_input,
+                prefetch_window,
+                include_variants,
+                dictionary,
+                max_results,
+                prefix_candidates,
+                prefix_variations
+            )
+            prefetch_window *= 2
         
-        # Generate variations on this substring
+        # Generate variations on this substring (usually already done when prefetching)
         if include_variants:
-            # Expand ー to its various possibilities
-            variations.extend(expand_choon(current_input))
-            
-            # See if there are any 旧字体 we can convert to 新字体
-            to_new = kyuujitai_to_shinjitai(current_input)
-            if to_new != current_input:
-                variations.append(to_new)
+            variations = prefix_variations.get(current_input)
+            if variations is None:
+                variations = get_variations(current_input)
+        else:
+            variations = [current_input]
         
         current_input_length = input_lengths[len(current_input)] if len(current_input) < len(input_lengths) else input_lengths[-1]
         
@@ -126,7 +172,8 @@ def word_search(
                 have,
                 max_results,
                 current_input_length,
-                current_input  # Pass current shortened input for matchRange setting
+                current_input,  # Pass current shortened input for matchRange setting
+                prefix_candidates.get(variant)
             )
             
             if not word_results:
@@ -184,13 +231,68 @@ def word_search(
     )
 
 
+def prefetch_prefixes(
+    prefix: str,
+    count: int,
+    include_variants: bool,
+    dictionary: Dictionary,
+    max_results: int,
+    prefix_candidates: Dict[str, List[CandidateWord]],
+    prefix_variations: Dict[str, List[str]]
+):
+    """
+    Deinflect the next prefixes to be tried by word_search, and prefetch their candidates.
+    
+    Args:
+        prefix: Longest prefix to deinflect
+        count: Number of prefixes to deinflect (each shortened like in word_search)
+        include_variants: If True, also deinflect the variations of each prefix
+        dictionary: Dictionary to prefetch the candidates from
+        max_results: Maximum number of results of the search
+        prefix_candidates: Deinflection results by prefix, updated in place
+        prefix_variations: Results of get_variations by prefix, updated in place
+                           (if include_variants is set)
+    """
+    words: List[str] = []
+    for _ in range(count):
+        if not prefix or is_only_digits(prefix):
+            break
+        if include_variants:
+            variations = prefix_variations[prefix] = get_variations(prefix)
+        else:
+            variations = [prefix]
+        for variant in variations:
+            if variant not in prefix_candidates:
+                candidates = deinflect(variant)
+                prefix_candidates[variant] = candidates
+                words.extend(candidate.word for candidate in candidates)
+        prefix = prefix[:len(prefix) - (2 if ends_in_yoon(prefix) else 1)]
+    dictionary.prefetch_words(words, candidate_lookup_max(max_results))
+
+
+def candidate_lookup_max(max_results: int) -> int:
+    """
+    Get the number of dictionary results to look up per candidate.
+    
+    Args:
+        max_results: Maximum number of results of the search
+        
+    Returns:
+        Maximum number of results to pass to the dictionary
+    """
+    # Get more results than max_results so we can sort and pick the best ones
+    # Use a multiplier to ensure we get enough results for proper sorting
+    return max(max_results * 3, 20)  # Get at least 20 or 3x max_results
+
+
 def lookup_candidates(
     input_text: str,
     dictionary: Dictionary,
     existing_entries: Set[int],
     max_results: int,
     input_length: int,
-    original_search_text: Optional[str] = None
+    original_search_text: Optional[str] = None,
+    candidates: Optional[List[CandidateWord]] = None
 ) -> List[WordResult]:
     """
     Look up candidates for a given input, handling deinflection.
@@ -201,6 +303,8 @@ def lookup_candidates(
         existing_entries: Set of entry IDs we already have
         max_results: Maximum number of results
         input_length: Original input length for this match
+        original_search_text: Text to set matchRange for (input_text if None)
+        candidates: Result of deinflect(input_text), if already known
         
     Returns:
         List of WordResult objects
@@ -208,19 +312,22 @@ def lookup_candidates(
     candidate_results: List[WordResult] = []
     
     # Deinflect the input to get candidate dictionary forms
-    candidates = deinflect(input_text)
-    
-    for candidate_index, candidate in enumerate(candidates):
-        # Look up this candidate in the dictionary
-        # Get more results than max_results so we can sort and pick the best ones
-        # Use a multiplier to ensure we get enough results for proper sorting
-        lookup_max = max(max_results * 3, 20)  # Get at least 20 or 3x max_results
-        # Pass original_search_text (or input_text if not provided) as matching_text
-        # matchRange should be based on the original input text, not the deinflected form
-        # This matches 10ten Reader's behavior where matchingText is the original input
-        matching_text = original_search_text if original_search_text is not None else input_text
-        word_entries = dictionary.get_words(candidate.word, lookup_max, matching_text=matching_text)
-        
+    if candidates is None:
+        candidates = deinflect(input_text)
+    
+    # Look up all candidates in the dictionary at once
+    lookup_max = candidate_lookup_max(max_results)
+    # Pass original_search_text (or input_text if not provided) as matching_text
+    # matchRange should be based on the original input text, not the deinflected form
+    # This matches 10ten Reader's behavior where matchingText is the original input
+    matching_text = original_search_text if original_search_text is not None else input_text
+    candidate_entries = dictionary.get_words_many(
+        [candidate.word for candidate in candidates],
+        lookup_max,
+        matching_text=matching_text
+    )
+    
+    for candidate_index, (candidate, word_entries) in enumerate(zip(candidates, candidate_entries)):
         # Filter by word type if this is a deinflection (not the original)
         is_deinflection = candidate_index != 0
         if is_deinflection:
@@ -14,6 +14,9 @@ YOON_START = [
 # ゃゅょ
 SMALL_Y = [0x3083, 0x3085, 0x3087]
 
+_YOON_START_SET = frozenset(YOON_START)
+_SMALL_Y_SET = frozenset(SMALL_Y)
+
 
 def ends_in_yoon(input_text: str) -> bool:
     """
@@ -25,25 +28,11 @@ def ends_in_yoon(input_text: str) -> bool:
     Returns:
         True if the text ends in a yoon (e.g., きゃ, しゅ, ちょ)
     """
-    if not input_text:
-        return False
-    
-    # Convert to list of characters to handle surrogate pairs correctly
-    chars = list(input_text)
-    length = len(chars)
-    
-    if length < 2:
+    # Python strings index by code point, so only the last two need looking at
+    if len(input_text) < 2:
         return False
     
-    # Get the last two characters' code points
-    last_char = chars[-1]
-    second_last_char = chars[-2]
-    
-    last_cp = ord(last_char) if len(last_char) == 1 else ord(last_char[0])
-    second_last_cp = ord(second_last_char) if len(second_last_char) == 1 else ord(second_last_char[0])
-    
     return (
-        last_cp in SMALL_Y and
-        second_last_cp in YOON_START
+        ord(input_text[-1]) in _SMALL_Y_SET and
+        ord(input_text[-2]) in _YOON_START_SET
     )
-